@@ -5,10 +5,14 @@ import { CornellLIIFetcher } from './fetchers/cornell-lii-fetcher.js';
 import { CFRFetcher } from './fetchers/cfr-fetcher.js';
 import { IRBFetcher } from './fetchers/irb-fetcher.js';
 import { TextChunker } from './utils/chunker.js';
+import type { Chunk } from './utils/chunker.js';
 import { EmbeddingsService } from './utils/embeddings.js';
+import type { EmbeddedChunk } from './utils/embeddings.js';
 import { qdrantService } from '../server/services/qdrant-service.js';
 import type { QdrantPoint } from '../server/services/qdrant-service.js';
 
+const QDRANT_BATCH_SIZE = 100; // Points per Qdrant upsert request
+
 /**
  * Main ingestion orchestrator
  * Fetches data from all three official tax authority sources
@@ -77,17 +81,18 @@ class AuthorityIngestionPipeline {
       }
 
       // Chunk documents
-      const allChunks = [];
-      for (const section of sections) {
-        const chunks = this.chunker.chunkDocument(section.text, {
-          source_type: 'usc',
-          citation: section.citation,
-          section: section.section,
-          title: section.title,
-          url: section.url,
-        });
-        allChunks.push(...chunks);
-      }
+      const allChunks = this.chunker.chunkDocuments(
+        sections.map((section) => ({
+          text: section.text,
+          metadata: {
+            source_type: 'usc',
+            citation: section.citation,
+            section: section.section,
+            title: section.title,
+            url: section.url,
+          },
+        }))
+      );
 
       console.log(`📦 Created ${allChunks.length} chunks`);
 
@@ -95,18 +100,15 @@ class AuthorityIngestionPipeline {
       const { tokens, cost } = this.embeddings.estimateCost(allChunks);
       console.log(`💰 Estimated cost: ${tokens.toLocaleString()} tokens ≈ $${cost.toFixed(4)}`);
 
-      // Generate embeddings
-      const embeddedChunks = await this.embeddings.generateEmbeddings(allChunks);
-
-      // Upload to Qdrant
-      await this.uploadToQdrant(embeddedChunks, 'usc');
+      // Generate embeddings and upload each batch as it completes
+      const vectorsUploaded = await this.embedAndUpload(allChunks, 'usc');
 
       // Record stats
       this.stats.push({
         source: 'US Code Title 26',
         documentsProcessed: sections.length,
         chunksCreated: allChunks.length,
-        vectorsUploaded: embeddedChunks.length,
+        vectorsUploaded,
         duration: Date.now() - startTime,
         estimatedCost: cost,
       });
@@ -140,18 +142,19 @@ class AuthorityIngestionPipeline {
       }
 
       // Chunk documents
-      const allChunks = [];
-      for (const regulation of regulations) {
-        const chunks = this.chunker.chunkDocument(regulation.text, {
-          source_type: 'cfr',
-          citation: regulation.citation,
-          part: regulation.part,
-          section: regulation.section,
-          title: regulation.title,
-          url: regulation.url,
-        });
-        allChunks.push(...chunks);
-      }
+      const allChunks = this.chunker.chunkDocuments(
+        regulations.map((regulation) => ({
+          text: regulation.text,
+          metadata: {
+            source_type: 'cfr',
+            citation: regulation.citation,
+            part: regulation.part,
+            section: regulation.section,
+            title: regulation.title,
+            url: regulation.url,
+          },
+        }))
+      );
 
       console.log(`📦 Created ${allChunks.length} chunks`);
 
@@ -159,27 +162,15 @@ class AuthorityIngestionPipeline {
       const { tokens, cost } = this.embeddings.estimateCost(allChunks);
       console.log(`💰 Estimated cost: ${tokens.toLocaleString()} tokens ≈ $${cost.toFixed(4)}`);
 
-      // Generate embeddings in batches to avoid memory issues
-      const batchSize = 1000;
-      let embeddedChunks = [];
-
-      for (let i = 0; i < allChunks.length; i += batchSize) {
-        const batch = allChunks.slice(i, i + batchSize);
-        console.log(`Processing batch ${Math.floor(i / batchSize) + 1}/${Math.ceil(allChunks.length / batchSize)}`);
-
-        const batchEmbedded = await this.embeddings.generateEmbeddings(batch);
-        embeddedChunks.push(...batchEmbedded);
-
-        // Upload batch to Qdrant immediately to save memory
-        await this.uploadToQdrant(batchEmbedded, 'cfr');
-      }
+      // Generate embeddings and upload each batch as it completes
+      const vectorsUploaded = await this.embedAndUpload(allChunks, 'cfr');
 
       // Record stats
       this.stats.push({
         source: 'CFR Title 26',
         documentsProcessed: regulations.length,
         chunksCreated: allChunks.length,
-        vectorsUploaded: embeddedChunks.length,
+        vectorsUploaded,
         duration: Date.now() - startTime,
         estimatedCost: cost,
       });
@@ -216,19 +207,20 @@ class AuthorityIngestionPipeline {
       }
 
       // Chunk documents
-      const allChunks = [];
-      for (const document of documents) {
-        const chunks = this.chunker.chunkDocument(document.text, {
-          source_type: document.type,
-          citation: document.citation,
-          number: document.number,
-          title: document.title,
-          bulletin_number: document.bulletinNumber,
-          bulletin_date: document.bulletinDate,
-          url: document.url,
-        });
-        allChunks.push(...chunks);
-      }
+      const allChunks = this.chunker.chunkDocuments(
+        documents.map((document) => ({
+          text: document.text,
+          metadata: {
+            source_type: document.type,
+            citation: document.citation,
+            number: document.number,
+            title: document.title,
+            bulletin_number: document.bulletinNumber,
+            bulletin_date: document.bulletinDate,
+            url: document.url,
+          },
+        }))
+      );
 
       console.log(`📦 Created ${allChunks.length} chunks`);
 
@@ -236,18 +228,15 @@ class AuthorityIngestionPipeline {
       const { tokens, cost } = this.embeddings.estimateCost(allChunks);
       console.log(`💰 Estimated cost: ${tokens.toLocaleString()} tokens ≈ $${cost.toFixed(4)}`);
 
-      // Generate embeddings
-      const embeddedChunks = await this.embeddings.generateEmbeddings(allChunks);
-
-      // Upload to Qdrant
-      await this.uploadToQdrant(embeddedChunks, 'irb');
+      // Generate embeddings and upload each batch as it completes
+      const vectorsUploaded = await this.embedAndUpload(allChunks, 'irb');
 
       // Record stats
       this.stats.push({
         source: `IRS Bulletins (${mode})`,
         documentsProcessed: documents.length,
         chunksCreated: allChunks.length,
-        vectorsUploaded: embeddedChunks.length,
+        vectorsUploaded,
         duration: Date.now() - startTime,
         estimatedCost: cost,
       });
@@ -259,31 +248,64 @@ class AuthorityIngestionPipeline {
     }
   }
 
+  /**
+   * Embed chunks and upload them to Qdrant in full upsert batches as they are
+   * ready, so memory holds only one upsert batch rather than the whole source
+   */
+  private async embedAndUpload(chunks: Chunk[], sourcePrefix: string): Promise<number> {
+    let pending: EmbeddedChunk[] = [];
+    let uploaded = 0;
+
+    // Embedding batches are token-limited (~5 chunks), so buffer them up to the upsert size
+    for await (const embeddedBatch of this.embeddings.generateEmbeddings(chunks)) {
+      pending.push(...embeddedBatch);
+
+      if (pending.length >= QDRANT_BATCH_SIZE) {
+        const ready = pending.slice(0, QDRANT_BATCH_SIZE);
+        pending = pending.slice(QDRANT_BATCH_SIZE);
+        await this.uploadToQdrant(ready, sourcePrefix);
+        uploaded += ready.length;
+      }
+    }
+
+    // Flush the remainder
+    if (pending.length > 0) {
+      await this.uploadToQdrant(pending, sourcePrefix);
+      uploaded += pending.length;
+    }
+
+    return uploaded;
+  }
+
   /**
    * Upload embedded chunks to Qdrant
    */
-  private async uploadToQdrant(embeddedChunks: any[], sourcePrefix: string): Promise<void> {
+  private async uploadToQdrant(embeddedChunks: EmbeddedChunk[], sourcePrefix: string): Promise<void> {
     console.log(`☁️  Uploading ${embeddedChunks.length} vectors to Qdrant...`);
 
-    // Convert to Qdrant points
-    const points: QdrantPoint[] = embeddedChunks.map((chunk) => ({
-      id: chunk.id,
-      vector: chunk.embedding,
-      payload: {
-        text: chunk.text,
-        ...chunk.metadata,
-      },
-    }));
-
-    // Upload in batches of 100
-    const batchSize = 100;
-    for (let i = 0; i < points.length; i += batchSize) {
-      const batch = points.slice(i, i + batchSize);
+    // Upload in batches of 100, converting to Qdrant points one batch at a time
+    const batchSize = QDRANT_BATCH_SIZE;
+    for (let i = 0; i < embeddedChunks.length; i += batchSize) {
+      const end = Math.min(i + batchSize, embeddedChunks.length);
+      const batch: QdrantPoint[] = [];
+
+      for (let j = i; j < end; j++) {
+        const chunk = embeddedChunks[j];
+        batch.push({
+          id: chunk.id,
+          vector: Array.from(chunk.embedding),
+          payload: {
+            text: chunk.text,
+            ...chunk.metadata,
+          },
+        });
+      }
+
       await qdrantService.upsert(batch);
-      console.log(`  Uploaded batch ${Math.floor(i / batchSize) + 1}/${Math.ceil(points.length / batchSize)}`);
+      console.log(`  Uploaded batch ${Math.floor(i / batchSize) + 1}/${Math.ceil(embeddedChunks.length / batchSize)}`);
     }
 
-    console.log(`✅ Uploaded ${points.length} vectors to Qdrant`);
+    console.log(`✅ Uploaded ${embeddedChunks.length} vectors to Qdrant`);
   }
 
   /**
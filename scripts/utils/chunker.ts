@@ -8,6 +8,36 @@ export interface Chunk {
   id: string;
 }
 
+// Compiled once at module load and reused across documents
+const PARAGRAPH_BREAK_RE = /\n\n+/g;
+const SENTENCE_BOUNDARY_RE = /(?<=[.!?])\s+(?=[A-Z])/g;
+const WHITESPACE_RE = /\s/;
+const LEADING_PUNCTUATION_RE = /^[^a-z0-9]+/;
+const INITIAL_RE = /^[a-z]\.$/;
+
+// Abbreviations common in tax authorities that end in a period but do not end a sentence
+const ABBREVIATIONS = new Set([
+  'u.s.', 'u.s.c.', 'i.r.c.', 'i.r.b.', 'c.b.', 'c.f.r.', 'cfr.', 't.d.', 't.c.',
+  'sec.', 'secs.', 'rev.', 'rul.', 'proc.', 'treas.', 'reg.', 'regs.', 'stat.', 'pub.',
+  'no.', 'nos.', 'par.', 'para.', 'subpar.', 'cl.', 'ch.', 'pt.', 'art.', 'cir.',
+  'inc.', 'corp.', 'co.', 'ltd.', 'v.', 'vs.', 'e.g.', 'i.e.', 'mr.', 'mrs.', 'ms.', 'dr.',
+]);
+const NON_ALPHANUMERIC_RE = /[^a-zA-Z0-9]/g;
+
+/**
+ * Yield paragraphs one at a time instead of splitting the whole document up front
+ */
+function* iterParagraphs(text: string): Generator<string> {
+  let start = 0;
+
+  for (const match of text.matchAll(PARAGRAPH_BREAK_RE)) {
+    yield text.slice(start, match.index);
+    start = match.index! + match[0].length;
+  }
+
+  yield text.slice(start);
+}
+
 export class TextChunker {
   private maxChunkSize: number;
   private overlapSize: number;
@@ -23,80 +53,96 @@ export class TextChunker {
    */
   chunkDocument(text: string, metadata: Record<string, any>): Chunk[] {
     const chunks: Chunk[] = [];
+    // Every chunk of a document shares its ID prefix, so build it once
+    const idPrefix = this.getChunkIdPrefix(metadata);
 
     // If text is short enough, return as single chunk
     if (text.length <= this.maxChunkSize) {
       chunks.push({
         text: text.trim(),
         metadata,
-        id: this.generateChunkId(metadata, 0),
+        id: idPrefix + '0',
       });
       return chunks;
     }
 
-    // Split into paragraphs first
-    const paragraphs = text.split(/\n\n+/);
-    let currentChunk = '';
+    // Accumulate the current chunk as parts and join once when it is emitted
+    let currentParts: string[] = [];
+    let currentLength = 0;
     let chunkIndex = 0;
 
-    for (let i = 0; i < paragraphs.length; i++) {
-      const paragraph = paragraphs[i].trim();
+    // Split into paragraphs first
+    for (const rawParagraph of iterParagraphs(text)) {
+      const paragraph = rawParagraph.trim();
 
       // If paragraph itself is too large, split it by sentences
       if (paragraph.length > this.maxChunkSize) {
         const sentences = this.splitIntoSentences(paragraph);
 
         for (const sentence of sentences) {
-          if (currentChunk.length + sentence.length > this.maxChunkSize && currentChunk.length > 0) {
+          if (currentLength + sentence.length > this.maxChunkSize && currentLength > 0) {
             chunks.push({
-              text: currentChunk.trim(),
+              text: currentParts.join('').trim(),
               metadata: {
                 ...metadata,
                 chunk_index: chunkIndex,
                 total_chunks: 0,
               },
-              id: this.generateChunkId(metadata, chunkIndex),
+              id: idPrefix + chunkIndex,
             });
 
             chunkIndex++;
-            const overlap = this.getLastWords(currentChunk, this.overlapSize);
-            currentChunk = overlap + ' ' + sentence;
+            const overlap = this.getOverlapFromParts(currentParts, this.overlapSize);
+            currentParts = [overlap, ' ', sentence];
+            currentLength = overlap.length + 1 + sentence.length;
           } else {
-            currentChunk += (currentChunk ? ' ' : '') + sentence;
+            if (currentLength > 0) {
+              currentParts.push(' ');
+              currentLength += 1;
+            }
+            currentParts.push(sentence);
+            currentLength += sentence.length;
           }
         }
       } else {
         // Normal paragraph handling
-        if (currentChunk.length + paragraph.length > this.maxChunkSize && currentChunk.length > 0) {
+        if (currentLength + paragraph.length > this.maxChunkSize && currentLength > 0) {
           chunks.push({
-            text: currentChunk.trim(),
+            text: currentParts.join('').trim(),
             metadata: {
               ...metadata,
               chunk_index: chunkIndex,
               total_chunks: 0,
             },
-            id: this.generateChunkId(metadata, chunkIndex),
+            id: idPrefix + chunkIndex,
           });
 
           chunkIndex++;
-          const overlap = this.getLastWords(currentChunk, this.overlapSize);
-          currentChunk = overlap + ' ' + paragraph;
+          const overlap = this.getOverlapFromParts(currentParts, this.overlapSize);
+          currentParts = [overlap, ' ', paragraph];
+          currentLength = overlap.length + 1 + paragraph.length;
         } else {
-          currentChunk += (currentChunk ? '\n\n' : '') + paragraph;
+          if (currentLength > 0) {
+            currentParts.push('\n\n');
+            currentLength += 2;
+          }
+          currentParts.push(paragraph);
+          currentLength += paragraph.length;
         }
       }
     }
 
     // Add final chunk
-    if (currentChunk.trim()) {
+    const finalChunk = currentParts.join('').trim();
+    if (finalChunk) {
       chunks.push({
-        text: currentChunk.trim(),
+        text: finalChunk,
         metadata: {
           ...metadata,
           chunk_index: chunkIndex,
           total_chunks: 0,
         },
-        id: this.generateChunkId(metadata, chunkIndex),
+        id: idPrefix + chunkIndex,
       });
     }
 
@@ -108,15 +154,83 @@ export class TextChunker {
     return chunks;
   }
 
+  /**
+   * Chunk a batch of documents into a single flat list
+   */
+  chunkDocuments(documents: Array<{ text: string; metadata: Record<string, any> }>): Chunk[] {
+    const chunks: Chunk[] = [];
+
+    for (const document of documents) {
+      for (const chunk of this.chunkDocument(document.text, document.metadata)) {
+        chunks.push(chunk);
+      }
+    }
+
+    return chunks;
+  }
+
   /**
    * Split text into sentences for finer-grained chunking
    */
   private splitIntoSentences(text: string): string[] {
-    // Split on sentence boundaries (. ! ?) followed by space and capital letter
-    // Also handle common abbreviations
-    const sentences = text.match(/[^.!?]+[.!?]+(?=\s+[A-Z]|$)/g) || [text];
+    // Split on sentence boundaries (. ! ?) followed by space and capital letter,
+    // skipping boundaries that follow an abbreviation like "U.S.C." or "Rev. Rul."
+    const sentences: string[] = [];
+    let start = 0;
+
+    for (const match of text.matchAll(SENTENCE_BOUNDARY_RE)) {
+      const end = match.index!;
+      if (this.endsWithAbbreviation(text, end, end + match[0].length)) continue;
 
-    return sentences.map((s) => s.trim()).filter((s) => s.length > 0);
+      const sentence = text.slice(start, end).trim();
+      if (sentence.length > 0) {
+        sentences.push(sentence);
+      }
+      start = end + match[0].length;
+    }
+
+    // Keep trailing text even if it has no closing punctuation
+    const tail = text.slice(start).trim();
+    if (tail.length > 0) {
+      sentences.push(tail);
+    }
+
+    return sentences;
+  }
+
+  /**
+   * Check whether the word ending at `end` is a known abbreviation or an initial
+   * (`next` is where the following word starts)
+   */
+  private endsWithAbbreviation(text: string, end: number, next: number): boolean {
+    let start = end;
+    while (start > 0 && !WHITESPACE_RE.test(text[start - 1])) start--;
+
+    const word = this.normalizeWord(text.slice(start, end));
+    if (ABBREVIATIONS.has(word)) return true;
+    if (!INITIAL_RE.test(word)) return false;
+
+    // A lone letter usually ends a sentence ("Part I. The", "Schedule C. Each");
+    // only treat it as an initial when next to another one ("J. R. Smith")
+    let prevEnd = start;
+    while (prevEnd > 0 && WHITESPACE_RE.test(text[prevEnd - 1])) prevEnd--;
+    let prevStart = prevEnd;
+    while (prevStart > 0 && !WHITESPACE_RE.test(text[prevStart - 1])) prevStart--;
+
+    let nextEnd = next;
+    while (nextEnd < text.length && !WHITESPACE_RE.test(text[nextEnd])) nextEnd++;
+
+    return (
+      INITIAL_RE.test(this.normalizeWord(text.slice(prevStart, prevEnd))) ||
+      INITIAL_RE.test(this.normalizeWord(text.slice(next, nextEnd)))
+    );
+  }
+
+  /**
+   * Lowercase a word and strip leading punctuation such as "(" or quotes
+   */
+  private normalizeWord(word: string): string {
+    return word.toLowerCase().replace(LEADING_PUNCTUATION_RE, '');
   }
 
   /**
@@ -132,12 +246,28 @@ export class TextChunker {
   }
 
   /**
-   * Generate unique chunk ID
+   * Get the overlap for the next chunk from only the trailing parts that
+   * cover the last maxLength characters, rather than the whole joined chunk
+   */
+  private getOverlapFromParts(parts: string[], maxLength: number): string {
+    let start = parts.length;
+    let length = 0;
+
+    while (start > 0 && length <= maxLength) {
+      start--;
+      length += parts[start].length;
+    }
+
+    return this.getLastWords(parts.slice(start).join(''), maxLength);
+  }
+
+  /**
+   * Build the chunk ID prefix shared by every chunk of a document
    */
-  private generateChunkId(metadata: Record<string, any>, chunkIndex: number): string {
+  private getChunkIdPrefix(metadata: Record<string, any>): string {
     const source = metadata.source_type || 'unknown';
-    const citation = metadata.citation?.replace(/[^a-zA-Z0-9]/g, '-') || 'unknown';
-    return `${source}-${citation}-chunk-${chunkIndex}`;
+    const citation = metadata.citation?.replace(NON_ALPHANUMERIC_RE, '-') || 'unknown';
+    return `${source}-${citation}-chunk-`;
   }
 
   /**
@@ -1,64 +1,108 @@
 import OpenAI from 'openai';
 import type { Chunk } from './chunker.js';
 
+const EMBEDDING_DIMENSIONS = 1536; // text-embedding-3-small
+
 export interface EmbeddedChunk extends Chunk {
-  embedding: number[];
+  embedding: Float32Array; // 4 bytes per dimension instead of an 8-byte double
+}
+
+/**
+ * Decode a base64 embedding (little-endian float32) without going through JSON floats
+ */
+function decodeEmbedding(base64: string): Float32Array {
+  const bytes = Buffer.from(base64, 'base64');
+  // Copy into a fresh buffer: pooled Buffers may not be 4-byte aligned
+  const embedding = new Float32Array(bytes.byteLength / 4);
+  new Uint8Array(embedding.buffer).set(bytes);
+  return embedding;
+}
+
+/**
+ * Conservative token estimate: 1 token ≈ 3 chars (safer than 4)
+ */
+function estimateTokens(text: string): number {
+  return Math.ceil(text.length / 3);
 }
 
 export class EmbeddingsService {
   private openai: OpenAI;
   private model: string = 'text-embedding-3-small';
   private batchSize: number = 40; // Reduced to stay under 300k token limit (each USC chunk ~2k chars = ~500 tokens, so 40 chunks ≈ 20k tokens << 300k)
+  private concurrency: number = 4; // Batches in flight at once; the SDK backs off on 429s
 
   constructor(apiKey?: string) {
     this.openai = new OpenAI({
       apiKey: apiKey || process.env.OPENAI_API_KEY,
+      maxRetries: 5, // Exponential backoff with jitter on rate limits and 5xx errors
     });
   }
 
   /**
-   * Generate embeddings for a batch of chunks
+   * Generate embeddings for a list of chunks, yielding one embedded batch at a
+   * time in input order so callers can upload and release each batch as it lands
    */
-  async generateEmbeddings(chunks: Chunk[]): Promise<EmbeddedChunk[]> {
+  async *generateEmbeddings(chunks: Chunk[]): AsyncGenerator<EmbeddedChunk[]> {
     console.log(`🔮 Generating embeddings for ${chunks.length} chunks...`);
 
-    const embeddedChunks: EmbeddedChunk[] = [];
     const batches = this.batchChunks(chunks, this.batchSize);
+    const inFlight: Promise<EmbeddedChunk[]>[] = [];
+    let nextBatch = 0;
+    let generated = 0;
 
-    for (let i = 0; i < batches.length; i++) {
-      const batch = batches[i];
-      console.log(`  Processing batch ${i + 1}/${batches.length} (${batch.length} chunks)`);
-
-      try {
-        const response = await this.openai.embeddings.create({
-          model: this.model,
-          input: batch.map((chunk) => chunk.text),
-          encoding_format: 'float',
-        });
-
-        // Combine chunks with their embeddings
-        for (let j = 0; j < batch.length; j++) {
-          embeddedChunks.push({
-            ...batch[j],
-            embedding: response.data[j].embedding,
-          });
-        }
+    const startNextBatch = () => {
+      const i = nextBatch++;
+      console.log(`  Processing batch ${i + 1}/${batches.length} (${batches[i].length} chunks)`);
 
-        // Add small delay between batches to avoid rate limits
-        if (i < batches.length - 1) {
-          await this.delay(100);
-        }
-      } catch (error) {
+      const request = this.embedBatch(batches[i]).catch((error) => {
         if (error instanceof Error) {
           console.error(`❌ Failed to generate embeddings for batch ${i + 1}:`, error.message);
-          throw error;
         }
         throw error;
+      });
+      // Rethrown when awaited below; don't report it as unhandled while earlier batches finish
+      request.catch(() => {});
+      inFlight.push(request);
+    };
+
+    // Keep up to `concurrency` requests in flight; start the next one before
+    // yielding so it runs while the caller processes the current batch
+    while (nextBatch < batches.length && inFlight.length < this.concurrency) {
+      startNextBatch();
+    }
+
+    while (inFlight.length > 0) {
+      const embedded = await inFlight.shift()!;
+      if (nextBatch < batches.length) {
+        startNextBatch();
       }
+
+      generated += embedded.length;
+      yield embedded;
     }
 
-    console.log(`✅ Generated ${embeddedChunks.length} embeddings`);
-    return embeddedChunks;
+    console.log(`✅ Generated ${generated} embeddings`);
+  }
+
+  /**
+   * Embed a single batch of chunks in one API request
+   */
+  private async embedBatch(batch: Chunk[]): Promise<EmbeddedChunk[]> {
+    const response = await this.openai.embeddings.create({
+      model: this.model,
+      input: batch.map((chunk) => chunk.text),
+      encoding_format: 'base64', // ~4 bytes per dimension on the wire instead of JSON float text
+    });
+
+    // Combine chunks with their embeddings
+    return batch.map((chunk, j) => {
+      // With an explicit base64 format the SDK passes the raw string through
+      const embedding = decodeEmbedding(response.data[j].embedding as unknown as string);
+      if (embedding.length !== EMBEDDING_DIMENSIONS) {
+        throw new Error(`Expected ${EMBEDDING_DIMENSIONS}-dim embedding, got ${embedding.length}`);
+      }
+      return { ...chunk, embedding };
+    });
   }
 
   /**
@@ -96,19 +140,22 @@ export class EmbeddingsService {
     let currentTokens = 0;
 
     for (const item of items) {
-      // Conservative token estimate: 1 token ≈ 3 chars (safer than 4)
-      const estimatedTokens = Math.ceil(item.text.length / 3);
+      // Estimate once per chunk
+      let finalTokens = estimateTokens(item.text);
 
       // If single chunk exceeds limit, truncate it
-      if (estimatedTokens > MAX_TOKENS_PER_CHUNK) {
+      if (finalTokens > MAX_TOKENS_PER_CHUNK) {
         console.warn(
-          `⚠️  Chunk exceeds ${MAX_TOKENS_PER_CHUNK} token limit (${estimatedTokens} tokens). Truncating from ${item.text.length} chars to ${MAX_TOKENS_PER_CHUNK * 3} chars.`
+          `⚠️  Chunk exceeds ${MAX_TOKENS_PER_CHUNK} token limit (${finalTokens} tokens). Truncating from ${item.text.length} chars to ${MAX_TOKENS_PER_CHUNK * 3} chars.`
         );
-        item.text = item.text.substring(0, MAX_TOKENS_PER_CHUNK * 3);
-      }
+        let end = MAX_TOKENS_PER_CHUNK * 3;
+        // Don't leave a lone high surrogate at the cut
+        const lastCode = item.text.charCodeAt(end - 1);
+        if (lastCode >= 0xd800 && lastCode <= 0xdbff) end--;
 
-      // Recalculate after potential truncation
-      const finalTokens = Math.ceil(item.text.length / 3);
+        item.text = item.text.substring(0, end);
+        finalTokens = MAX_TOKENS_PER_CHUNK; // Known from the cut length; no need to re-estimate
+      }
 
       // If adding this chunk exceeds limit OR batch size, start new batch
       if (
@@ -132,13 +179,6 @@ export class EmbeddingsService {
     return batches;
   }
 
-  /**
-   * Delay helper
-   */
-  private delay(ms: number): Promise<void> {
-    return new Promise((resolve) => setTimeout(resolve, ms));
-  }
-
   /**
    * Calculate estimated cost for embeddings
    * text-embedding-3-small: $0.02 per 1M tokens
@@ -6,6 +6,9 @@ const openai = new OpenAI({
   apiKey: process.env.OPENAI_API_KEY || "default_key"
 });
 
+// Resolved once at startup rather than on every query
+const MODEL_NAME = process.env.OPENAI_MODEL_NAME || "gpt-4o-mini";
+
 const SYSTEM_PROMPT = `You are Taxentia, an AI tax research assistant for CPAs, tax attorneys, and Enrolled Agents.
 
 PROFESSIONAL STANDARDS:
@@ -162,12 +165,11 @@ INSTRUCTIONS: Analyze using authority hierarchy (IRC→Regs→Pubs→Rulings→C
   }
 
   private async generateWithGPT4oMini(userPrompt: string, authorities: any[]): Promise<TaxResponse> {
-    const modelName = process.env.OPENAI_MODEL_NAME || "gpt-4o-mini";
-    console.log("Calling OpenAI with model:", modelName);
+    console.log("Calling OpenAI with model:", MODEL_NAME);
 
     try {
       const response = await openai.chat.completions.create({
-        model: modelName,
+        model: MODEL_NAME,
         messages: [
           { role: "system", content: SYSTEM_PROMPT },
           { role: "user", content: userPrompt }
@@ -195,7 +197,7 @@ INSTRUCTIONS: Analyze using authority hierarchy (IRC→Regs→Pubs→Rulings→C
       if (error?.error?.code === 'unsupported_parameter') {
         console.log("JSON mode not supported, falling back to regular mode");
         const response = await openai.chat.completions.create({
-          model: modelName,
+          model: MODEL_NAME,
           messages: [
             { role: "system", content: SYSTEM_PROMPT + "\n\nIMPORTANT: You must respond with valid JSON only, no other text." },
             { role: "user", content: userPrompt }
@@ -74,12 +74,11 @@ export async function fetchIrcSections(): Promise<IrcSection[]> {
       const headingMatch = /<heading>(.*?)<\/heading>/s.exec(sectionContent);
       const heading = headingMatch ? headingMatch[1].replace(/<[^>]+>/g, '').trim() : '';
 
-      // Extract text content (remove all XML tags)
+      // Extract text content: drop heading/num elements, then collapse every
+      // run of tags and whitespace to a single space in one pass
       const textContent = sectionContent
-        .replace(/<heading>.*?<\/heading>/gs, '')
-        .replace(/<num[^>]*>.*?<\/num>/gs, '')
-        .replace(/<[^>]+>/g, ' ')
-        .replace(/\s+/g, ' ')
+        .replace(/<heading>.*?<\/heading>|<num[^>]*>.*?<\/num>/gs, '')
+        .replace(/(?:<[^>]+>|\s)+/g, ' ')
         .trim();
 
       // Only include sections with actual content
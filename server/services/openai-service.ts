@@ -6,6 +6,9 @@ const openai = new OpenAI({
   apiKey: process.env.OPENAI_API_KEY || process.env.OPENAI_API_KEY_ENV_VAR || "default_key"
 });
 
+// Resolved once at startup rather than on every query
+const MODEL_NAME = process.env.OPENAI_MODEL_NAME || "gpt-4-turbo";
+
 const SYSTEM_PROMPT = `You are Taxentia, an AI tax research assistant for CPAs, tax attorneys, and Enrolled Agents.
 
 PROFESSIONAL STANDARDS:
@@ -139,15 +142,14 @@ ${contextText}
 INSTRUCTIONS: Analyze using authority hierarchy (IRC→Regs→Pubs→Rulings→Cases). Generate precise pinpoint citations. Include direct URLs when possible. Provide actionable procedural guidance. Be comprehensive but token-efficient.`;
 
       // 4. Generate the final response
-      const modelName = process.env.OPENAI_MODEL_NAME || "gpt-4-turbo";
-      console.log("Calling OpenAI with model:", modelName);
+      console.log("Calling OpenAI with model:", MODEL_NAME);
       console.log("User prompt length:", userPrompt.length);
       
       // Try with JSON mode first, fallback without it if not supported
       let response;
       try {
         response = await openai.chat.completions.create({
-          model: modelName,
+          model: MODEL_NAME,
           messages: [
             { role: "system", content: SYSTEM_PROMPT },
             { role: "user", content: userPrompt }
@@ -160,7 +162,7 @@ INSTRUCTIONS: Analyze using authority hierarchy (IRC→Regs→Pubs→Rulings→C
         if (error?.error?.code === 'unsupported_parameter' && error?.error?.param === 'response_format') {
           console.log("JSON mode not supported, falling back to regular mode");
           response = await openai.chat.completions.create({
-            model: modelName,
+            model: MODEL_NAME,
             messages: [
               { role: "system", content: SYSTEM_PROMPT + "\n\nIMPORTANT: You must respond with valid JSON only, no other text." },
               { role: "user", content: userPrompt }
@@ -12,30 +12,137 @@ export interface QdrantSearchResult {
   payload?: Record<string, any>;
 }
 
+/**
+ * 32-bit string hash behind Qdrant point IDs (returns a signed int32)
+ */
+function hashString(str: string): number {
+  let hash = 0;
+  for (let i = 0; i < str.length; i++) {
+    const char = str.charCodeAt(i);
+    hash = ((hash << 5) - hash) + char;
+    hash = hash & hash; // Convert to 32bit integer
+  }
+  return hash;
+}
+
+const PRIME32_1 = 0x9e3779b1;
+const PRIME32_2 = 0x85ebca77;
+const PRIME32_3 = 0xc2b2ae3d;
+const PRIME32_4 = 0x27d4eb2f;
+const PRIME32_5 = 0x165667b1;
+
+const utf8Encoder = new TextEncoder();
+
+function rotl32(x: number, r: number): number {
+  return (x << r) | (x >>> (32 - r));
+}
+
+function readU32LE(bytes: Uint8Array, i: number): number {
+  return bytes[i] | (bytes[i + 1] << 8) | (bytes[i + 2] << 16) | (bytes[i + 3] << 24);
+}
+
+function xxh32Round(acc: number, lane: number): number {
+  return Math.imul(rotl32((acc + Math.imul(lane, PRIME32_2)) | 0, 13), PRIME32_1);
+}
+
+/**
+ * XXH32 (seed 0) of a string's UTF-8 bytes, as an unsigned 32-bit integer
+ */
+function xxh32(str: string): number {
+  const bytes = utf8Encoder.encode(str);
+  const len = bytes.length;
+  let i = 0;
+  let h: number;
+
+  if (len >= 16) {
+    let v1 = (PRIME32_1 + PRIME32_2) | 0;
+    let v2 = PRIME32_2 | 0;
+    let v3 = 0;
+    let v4 = -PRIME32_1 | 0;
+
+    for (; i <= len - 16; i += 16) {
+      v1 = xxh32Round(v1, readU32LE(bytes, i));
+      v2 = xxh32Round(v2, readU32LE(bytes, i + 4));
+      v3 = xxh32Round(v3, readU32LE(bytes, i + 8));
+      v4 = xxh32Round(v4, readU32LE(bytes, i + 12));
+    }
+
+    h = (rotl32(v1, 1) + rotl32(v2, 7) + rotl32(v3, 12) + rotl32(v4, 18)) | 0;
+  } else {
+    h = PRIME32_5 | 0;
+  }
+
+  h = (h + len) | 0;
+
+  for (; i + 4 <= len; i += 4) {
+    h = Math.imul(rotl32((h + Math.imul(readU32LE(bytes, i), PRIME32_3)) | 0, 17), PRIME32_4);
+  }
+  for (; i < len; i++) {
+    h = Math.imul(rotl32((h + Math.imul(bytes[i], PRIME32_5)) | 0, 11), PRIME32_1);
+  }
+
+  h ^= h >>> 15;
+  h = Math.imul(h, PRIME32_2);
+  h ^= h >>> 13;
+  h = Math.imul(h, PRIME32_3);
+  h ^= h >>> 16;
+  return h >>> 0;
+}
+
+/**
+ * Ways to convert a string ID to a numeric ID for Qdrant, selected with QDRANT_ID_HASH.
+ * A collection must keep one scheme for its whole life: re-ingesting under a
+ * different scheme writes new points instead of overwriting the existing ones.
+ */
+const POINT_ID_HASHES = {
+  // Math.abs of the signed hash; what existing collections were built with
+  legacy: (str: string) => Math.abs(hashString(str)),
+  // Same hash read as unsigned: the full 32-bit range, so half the collisions
+  u32: (str: string) => hashString(str) >>> 0,
+  // XXH32: much better distribution than the polynomial hash; for new collections
+  xxh32,
+};
+
+type PointIdHash = keyof typeof POINT_ID_HASHES;
+
 class QdrantService {
   private client: QdrantClient;
   private collectionName: string;
+  private idHash: PointIdHash;
+  private stringToNumericId: (str: string) => number;
 
   constructor() {
     const qdrantUrl = process.env.QDRANT_URL || 'http://localhost:6333';
     const collectionName = process.env.QDRANT_COLLECTION_NAME || 'taxentia-authorities';
+    const idHash = process.env.QDRANT_ID_HASH || 'legacy';
+
+    if (!Object.hasOwn(POINT_ID_HASHES, idHash)) {
+      throw new Error(
+        `Unknown QDRANT_ID_HASH "${idHash}" (expected one of: ${Object.keys(POINT_ID_HASHES).join(', ')})`
+      );
+    }
 
     console.log('Qdrant service initialized:', {
       url: qdrantUrl,
-      collection: collectionName
+      collection: collectionName,
+      idHash
     });
 
     this.client = new QdrantClient({ url: qdrantUrl });
     this.collectionName = collectionName;
+    this.idHash = idHash as PointIdHash;
+    this.stringToNumericId = POINT_ID_HASHES[this.idHash];
   }
 
   /**
    * Initialize collection if it doesn't exist
    */
   async ensureCollection(vectorSize: number = 1536): Promise<void> {
+    let exists = false;
+
     try {
       const collections = await this.client.getCollections();
-      const exists = collections.collections.some(
+      exists = collections.collections.some(
         (col) => col.name === this.collectionName
       );
 
@@ -58,6 +165,43 @@ class QdrantService {
       }
       throw new Error('Failed to ensure Qdrant collection exists.');
     }
+
+    if (exists) {
+      await this.assertIdHashMatches();
+    }
+  }
+
+  /**
+   * Make sure existing points were keyed with the configured ID scheme, so
+   * re-ingestion overwrites them instead of writing duplicates
+   */
+  private async assertIdHashMatches(): Promise<void> {
+    let existingIdHash: string;
+
+    try {
+      const { points } = await this.client.scroll(this.collectionName, {
+        limit: 1,
+        with_payload: ['idHash'],
+        with_vector: false,
+      });
+      if (points.length === 0) return;
+
+      // Points written before the scheme was recorded used legacy IDs
+      existingIdHash = (points[0].payload?.idHash as string | undefined) || 'legacy';
+    } catch (error: unknown) {
+      console.error('Error reading collection ID scheme:', error);
+      if (error instanceof Error) {
+        console.error('Qdrant client error details:', error.message);
+      }
+      throw new Error('Failed to read Qdrant collection ID scheme.');
+    }
+
+    if (existingIdHash !== this.idHash) {
+      throw new Error(
+        `Collection ${this.collectionName} uses QDRANT_ID_HASH=${existingIdHash} but ${this.idHash} is configured; ` +
+        'writing to it would duplicate existing points.'
+      );
+    }
   }
 
   /**
@@ -94,20 +238,6 @@ class QdrantService {
     }
   }
 
-  /**
-   * Convert string ID to numeric ID for Qdrant
-   * Uses a simple hash function to create consistent numeric IDs from strings
-   */
-  private stringToNumericId(str: string): number {
-    let hash = 0;
-    for (let i = 0; i < str.length; i++) {
-      const char = str.charCodeAt(i);
-      hash = ((hash << 5) - hash) + char;
-      hash = hash & hash; // Convert to 32bit integer
-    }
-    return Math.abs(hash);
-  }
-
   /**
    * Upsert vectors to collection
    * @param points - Array of points with id, vector, and optional payload
@@ -121,7 +251,8 @@ class QdrantService {
           vector: point.vector,
           payload: {
             ...point.payload,
-            originalId: point.id.toString() // Store original ID in payload
+            originalId: point.id.toString(), // Store original ID in payload
+            idHash: this.idHash, // Scheme used to derive the numeric ID
           },
         })),
       });